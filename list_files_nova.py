@@ -3,9 +3,14 @@
 # On Windows it is ignored, which is fine.
 
 import os, re, sys
+import io  # StringIO builds large compare results without repeated string copies
+import mmap  # lets the compare file loader decode straight from mapped pages
+import queue  # hands results from the walk worker thread back to the UI thread
+import threading  # runs the folder walk off the Tk mainloop so the window stays live
 # os is used for walking folders and files
 # re is used for splitting text with regular expressions for natural sorting
-# sys is not currently used but is a common standard import and harmless to keep
+# sys provides sys.intern, which speeds up the compare set lookups
+from functools import lru_cache  # lru_cache memoizes natural_key so repeated strings are only split once
 from pathlib import Path  # Path gives a nicer, object oriented way to work with filesystem paths
 import tkinter as tk  # tk is the standard Python interface to the Tk GUI toolkit
 from tkinter import filedialog, messagebox  # handy dialogs for file picking and popup messages
@@ -42,12 +47,119 @@ THEMES = {
     },
 }
 
+# Compiled once at import time so natural_key does not pay the cost of
+# looking the pattern up in re's internal cache on every single call.
+_NUM_RE = re.compile(r"(\d+)")
+
 # Natural sort helper.
 # It splits the string into text and number chunks. Numbers are converted to int.
+# The same string can be keyed several times in one compare (normalize plus the
+# result sorts), so the result is memoized. The cap keeps memory bounded for huge lists.
+@lru_cache(maxsize=200_000)
 def natural_key(s: str):
-    # re.split with capture group keeps the digits. Non digits stay as text.
-    # For text, we use casefold to normalize case so the sort is stable and case insensitive when comparing letters.
-    return [int(t) if t.isdigit() else t.casefold() for t in re.split(r"(\d+)", s)]
+    # The capture group in _NUM_RE keeps the digits. Non digits stay as text.
+    # Casefold normalizes case so the sort is case insensitive when comparing letters.
+    # Folding the whole string once is cheaper than folding every text chunk, and it
+    # cannot move the digit boundaries since casefold never produces digits.
+    # A tuple is returned rather than a list: it is lighter to cache and compares the same way.
+    return tuple(int(t) if t.isdigit() else t for t in _NUM_RE.split(s.casefold()))
+
+# Variant of natural_key that keeps the text chunks exactly as given.
+# The compare path lowercases strings up front when case insensitive is on,
+# so casefolding again inside the key would repeat work already done.
+@lru_cache(maxsize=200_000)
+def natural_key_cased(s: str):
+    return tuple(int(t) if t.isdigit() else t for t in _NUM_RE.split(s))
+
+# Parsing helper behind App._normalize_list: strips, drops blanks, dedups
+# keeping the first occurrence, and lowercases when asked. Interning lets the
+# compare sets fall back to pointer comparison when the same name appears in
+# both lists, since A and B both pass through here. Very long lines are left
+# alone to keep the intern table small.
+def _parse_list(raw, case_insensitive):
+    if not case_insensitive:
+        # Case sensitive path: dict.fromkeys dedups in C while keeping the
+        # first occurrence, so there is no per-line set bookkeeping in Python.
+        # Blank lines collapse to one "" key that the filter drops.
+        return [sys.intern(s) if len(s) < 4096 else s
+                for s in dict.fromkeys(line.strip() for line in raw.splitlines()) if s]
+    items = []
+    seen = set()
+    for line in raw.splitlines():
+        s = line.strip()
+        if not s:
+            continue
+        k = s.lower()
+        if k in seen:
+            continue
+        seen.add(k)
+        items.append(sys.intern(k) if len(k) < 4096 else k)
+    return items
+
+# A handful of recent parses is plenty: the common repeat is clicking Compare
+# again with the same textarea contents while toggling other options.
+@lru_cache(maxsize=8)
+def _parse_list_cached(raw, case_insensitive):
+    return tuple(_parse_list(raw, case_insensitive))
+
+# The actual folder walk, kept free of any Tk access so it can run on a worker
+# thread while the mainloop stays responsive. opts is a plain dict snapshot of
+# the UI state built by App._snapshot_options.
+def _gather_names_sync(opts):
+    # opts["root"] arrives already resolved by App._resolved_root
+    root = Path(opts["root"])
+    if not root.exists() or not root.is_dir():
+        raise ValueError("Folder does not exist")
+    # Only the basename matters for the skip check, computed once outside the loops
+    out_base = os.path.basename(opts["out_name"])
+    names = []
+
+    inc_dirs = opts["include_dirs"]
+    inc_files = opts["include_files"]
+    # Binding the bound method to a local skips an attribute lookup per entry.
+    append = names.append
+    # A frozenset makes the per-entry check a single membership test and lets
+    # HIDDEN_NAMES grow without touching the loops below.
+    hidden = opts["hidden_names"] | {out_base} if opts["skip_output"] else opts["hidden_names"]
+
+    if opts["recurse"]:
+        # Walk through all subfolders with an explicit stack of scandir calls.
+        # Each stack item carries the relative prefix as a plain string, so we never
+        # build Path objects or call relative_to per entry like os.walk would need.
+        stack = [("", str(root))]
+        push = stack.append
+        while stack:
+            prefix, dirpath = stack.pop()
+            try:
+                entries = os.scandir(dirpath)
+            except OSError:
+                # Unreadable folder. os.walk silently skips these too.
+                continue
+            with entries:
+                for e in entries:
+                    # DirEntry caches the type from the directory read, so this
+                    # does not cost an extra stat call per entry.
+                    if e.is_dir(follow_symlinks=False):
+                        if inc_dirs and e.name not in hidden:
+                            append(prefix + e.name)
+                        push((prefix + e.name + os.sep, e.path))
+                    elif inc_files and e.name not in hidden:
+                        append(prefix + e.name)
+    else:
+        # Only the top level of the chosen folder. extend consumes the whole
+        # generator in one C-level call instead of a Python append per entry;
+        # e.name is already a basename, so the hidden check is a set membership test.
+        with os.scandir(root) as entries:
+            names.extend(
+                e.name for e in entries
+                if e.name not in hidden
+                and ((inc_dirs and e.is_dir()) or (inc_files and e.is_file()))
+            )
+
+    # Choose the sorting key based on the toggles
+    key_func = natural_key if opts["natural_sort"] else (str.casefold if opts["case_insensitive"] else None)
+    names.sort(key=key_func)
+    return names
 
 # Custom clickable button drawn on a Canvas.
 # Why do this instead of tk.Button?
@@ -61,8 +173,9 @@ class CButton(tk.Canvas):
         self.bg_color = bg          # normal background
         self.fg_color = fg          # text color
         self.hover_bg = hover_bg    # background when mouse is over
-        self._rect = None           # internal references to drawn shapes if needed later
+        self._rect = None           # canvas item ids, created on the first draw
         self._label = None
+        self._cur_fill = None       # fill currently painted, to skip no-op redraws
         self._draw(bg)              # initial paint
         # Bind mouse events for hover and click
         self.bind("<Enter>", lambda e: self._draw(self.hover_bg))
@@ -70,17 +183,38 @@ class CButton(tk.Canvas):
         self.bind("<Button-1>", lambda e: self.cmd())
 
     def _draw(self, fill):
-        # Redraw the button with a solid rectangle and centered text
-        self.delete("all")
-        w = int(self["width"]); h = int(self["height"])
-        # Simple rectangle gives a flat modern look. Rounded corners would require a custom polygon.
-        self.create_rectangle(0,0,w,h, outline="", fill=fill)
-        self.create_text(w//2, h//2, text=self.text, fill=self.fg_color, font=("Helvetica", 11, "bold"))
+        # Paint the button. The rectangle and label are created once; after that a
+        # hover just reconfigures the existing items, which is much cheaper than
+        # deleting and recreating them, and identical fills are skipped entirely
+        # so rapid mouse transits cost nothing.
+        if fill == self._cur_fill:
+            return
+        self._cur_fill = fill
+        if self._rect is None:
+            w = int(self["width"]); h = int(self["height"])
+            # Simple rectangle gives a flat modern look. Rounded corners would require a custom polygon.
+            self._rect = self.create_rectangle(0,0,w,h, outline="", fill=fill)
+            self._label = self.create_text(w//2, h//2, text=self.text, fill=self.fg_color, font=("Helvetica", 11, "bold"))
+        else:
+            self.itemconfig(self._rect, fill=fill)
+            # Keep the label color in sync too, since theme switches change it
+            self.itemconfig(self._label, fill=self.fg_color)
 
 # Main application. This is the root Tk window plus all widgets and behaviors.
 class App(tk.Tk):
+    # Names that are never listed, checked by basename during the walk.
+    # Empty by default; extend it to hide clutter like .DS_Store or Thumbs.db.
+    HIDDEN_NAMES = frozenset()
+
     def __init__(self):
         super().__init__()
+        # Stay hidden while the interface is built. Otherwise Tk maps the bare
+        # window immediately and reflows it visibly as each widget arrives; built
+        # hidden, all of that geometry chatter collapses into one final showing.
+        try:
+            self.withdraw()
+        except tk.TclError:
+            pass
         self.title(APP_TITLE)
         # geometry sets initial size. minsize prevents shrinking below a usable layout.
         self.geometry("900x660")
@@ -117,28 +251,45 @@ class App(tk.Tk):
 
         # If compare result text is extremely large, treat it as a special case
         self.comp_large_threshold_mb = 3
+        # Per widget tokens for the chunked text feeder, see _feed_text
+        self._feed_tokens = {}
+        # Snapshot of the active theme colors so hot paths like the resize
+        # handler do not re-read the StringVar and the THEMES dict every time
+        self._t = THEMES[self.theme_name.get()]
         # Build all widgets
         self._build_ui()
         # Paint them according to the selected theme
         self.apply_theme()
+        # Everything is constructed and themed, show the finished window
+        try:
+            self.deiconify()
+        except tk.TclError:
+            pass
 
     def _on_send_toggle(self, *args):
         """
         Ensure only one of Send to Compare A or Send to Compare B is on.
         If both somehow become true, prefer A and turn B off.
         """
-        try:
-            a = bool(self.send_to_a.get())
-            b = bool(self.send_to_b.get())
-        except Exception:
+        # Setting one var below fires the other var's trace, which re-enters this
+        # method for no reason. Skip the reentrant call instead of re-reading Tcl.
+        if getattr(self, "_in_toggle", False):
             return
-        # Avoid looping from setting one var inside the other's callback
-        if a and b:
-            self.send_to_b.set(False)
-        elif a:
-            self.send_to_b.set(False)
-        elif b:
-            self.send_to_a.set(False)
+        self._in_toggle = True
+        try:
+            try:
+                a = bool(self.send_to_a.get())
+                b = bool(self.send_to_b.get())
+            except Exception:
+                return
+            if a and b:
+                self.send_to_b.set(False)
+            elif a:
+                self.send_to_b.set(False)
+            elif b:
+                self.send_to_a.set(False)
+        finally:
+            self._in_toggle = False
 
     def _build_ui(self):
         """Create all visible widgets and lay them out with pack and grid where appropriate."""
@@ -298,6 +449,11 @@ class App(tk.Tk):
         self.compare_result = tk.Text(self.compare_group, wrap="none", height=10)
         self.compare_result.pack(fill="both", expand=True, pady=(6,0))
 
+        # When the header resizes, repaint just the header canvas so the accent bar
+        # spans the full width. Repainting the whole theme here would reconfigure
+        # every widget on each pixel of a resize drag.
+        self.header.bind("<Configure>", self._on_header_configure)
+
     def set_theme(self, name):
         """Switch theme by setting the selected name then repainting."""
         self.theme_name.set(name)
@@ -308,26 +464,20 @@ class App(tk.Tk):
         Read colors from THEMES and apply to all widgets.
         Called at startup and whenever the theme is changed.
         """
-        t = THEMES[self.theme_name.get()]
+        name = self.theme_name.get()
+        t = THEMES[name]
+        self._t = t
+        if getattr(self, "_theme_applied_for", None) == name:
+            # This theme is already painted on every widget. Only the header canvas
+            # depends on the current size, so refresh just that and return.
+            self._redraw_header(t)
+            return
         # window and groups
         for w in (self, self.opts, self.status.master, self.text.master):
             try: w.configure(bg=t["bg"])
             except tk.TclError: pass
 
-        # header drawing: a thin accent bar, then two text labels
-        self.header.delete("all")
-        self.header.configure(bg=t["bg"])
-        W = self.header.winfo_width() or self.header.winfo_reqwidth()
-        H = self.header.winfo_height() or 68
-        self.header.create_rectangle(0, H-6, W, H, fill=t["accent_purple"], width=0)
-        self.header.create_text(16, H//2, text="nova", anchor="w",
-                                font=("Helvetica", 24, "bold"),
-                                fill=t["accent_pink"])
-        self.header.create_text(95, H//2, text="Filename lister", anchor="w",
-                                font=("Helvetica", 14, "bold"),
-                                fill=t["fg"])
-        # When the header resizes, repaint so the accent bar spans the full width
-        self.header.bind("<Configure>", lambda e: self.apply_theme())
+        self._redraw_header(t)
 
         # entries and large text boxes
         for e in (self.dir_entry, self.out_entry, self.text, self.text_a, self.text_b, self.compare_result):
@@ -355,13 +505,48 @@ class App(tk.Tk):
             except tk.TclError:
                 pass
 
-        # Repaint custom buttons to match the theme
+        # Repaint custom buttons to match the theme. Clearing _cur_fill forces the
+        # redraw even if the new theme happens to reuse the same background color.
         for b in (self.browse_btn_canvas, self.preview_btn_canvas, self.write_btn_canvas):
             b.bg_color = t["btn_bg"]
             b.hover_bg = t["btn_hover"]
             b.fg_color = t["btn_fg"]
+            b._cur_fill = None
             b._draw(b.bg_color)
 
+        # Remember which theme is painted so resize events can take the cheap path
+        self._theme_applied_for = name
+
+    def _on_header_configure(self, event=None):
+        """
+        Coalesce the burst of Configure events a resize drag produces.
+        Instead of repainting the header for every pixel step, mark a repaint as
+        pending and let one timer callback a frame later do a single redraw.
+        """
+        if getattr(self, "_header_redraw_pending", False):
+            return
+        self._header_redraw_pending = True
+        self.after(16, self._do_redraw_header)
+
+    def _do_redraw_header(self):
+        """Timer callback for _on_header_configure: clear the flag and repaint once."""
+        self._header_redraw_pending = False
+        self._redraw_header(self._t)
+
+    def _redraw_header(self, t):
+        """Repaint only the header canvas: a thin accent bar, then two text labels."""
+        self.header.delete("all")
+        self.header.configure(bg=t["bg"])
+        W = self.header.winfo_width() or self.header.winfo_reqwidth()
+        H = self.header.winfo_height() or 68
+        self.header.create_rectangle(0, H-6, W, H, fill=t["accent_purple"], width=0)
+        self.header.create_text(16, H//2, text="nova", anchor="w",
+                                font=("Helvetica", 24, "bold"),
+                                fill=t["accent_pink"])
+        self.header.create_text(95, H//2, text="Filename lister", anchor="w",
+                                font=("Helvetica", 14, "bold"),
+                                fill=t["fg"])
+
     # ------------- Lister behavior functions -------------
 
     def browse_dir(self):
@@ -370,98 +555,194 @@ class App(tk.Tk):
         if path:
             self.dir_var.set(path)
 
+    def _resolved_root(self):
+        """
+        Resolve the chosen folder once per distinct entry value.
+        Path.resolve chases symlinks and stats every path component, so calling
+        it for every Preview or Write of the same folder is wasted syscalls.
+        The cache is keyed on the raw entry text and refreshed when it changes.
+        """
+        raw = self.dir_var.get()
+        cached = getattr(self, "_resolved_dir", None)
+        if cached is None or cached[0] != raw:
+            cached = (raw, str(Path(raw).resolve()))
+            self._resolved_dir = cached
+        return cached[1]
+
+    def _snapshot_options(self):
+        """
+        Read every Tk variable the walk needs into a plain dict.
+        Worker threads must never touch Tk, so all variable reads happen here
+        on the main thread and the walk gets only plain Python values.
+        """
+        return {
+            "root": self._resolved_root(),
+            "out_name": self.out_var.get().strip() or "filenames_sorted.txt",
+            "include_files": self.include_files.get(),
+            "include_dirs": self.include_dirs.get(),
+            "recurse": self.recurse.get(),
+            "skip_output": self.skip_output.get(),
+            "natural_sort": self.natural_sort.get(),
+            "case_insensitive": self.case_insensitive.get(),
+            "hidden_names": self.HIDDEN_NAMES,
+        }
+
     def gather_names(self):
         """
         Collect file and or folder names from the selected directory according to the option toggles.
         Returns a sorted list of relative names.
         Raises ValueError if the selected folder does not exist.
+        The buttons do not call this directly anymore; they go through
+        _start_gather so the walk runs on a worker thread.
         """
-        root = Path(self.dir_var.get()).resolve()
-        if not root.exists() or not root.is_dir():
-            raise ValueError("Folder does not exist")
-        out_name = self.out_var.get().strip() or "filenames_sorted.txt"
-        names = []
-
-        if self.recurse.get():
-            # Walk through all subfolders
-            for dirpath, dirnames, filenames in os.walk(root):
-                dpath = Path(dirpath)
-                if self.include_dirs.get():
-                    for d in dirnames:
-                        # relative_to makes the listing relative to the root, not absolute
-                        names.append(str((dpath / d).relative_to(root)))
-                if self.include_files.get():
-                    for f in filenames:
-                        names.append(str((dpath / f).relative_to(root)))
-        else:
-            # Only the top level of the chosen folder
-            for p in root.iterdir():
-                if p.is_dir() and self.include_dirs.get():
-                    names.append(p.name)
-                if p.is_file() and self.include_files.get():
-                    names.append(p.name)
-
-        # Optionally drop the output file from the list, so you do not list the file you are writing
-        if self.skip_output.get():
-            names = [n for n in names if Path(n).name != Path(out_name).name]
-
-        # Choose the sorting key based on the toggles
-        key_func = natural_key if self.natural_sort.get() else (str.casefold if self.case_insensitive.get() else None)
-        if not self.natural_sort.get() and not self.case_insensitive.get():
-            key_func = None
-        names.sort(key=key_func)
-        return names
+        return _gather_names_sync(self._snapshot_options())
 
-    def preview(self):
+    def _start_gather(self, done, work_after=None):
         """
-        Collect names and render up to 5000 entries into the big preview text box.
-        Also optionally copy the same names into Compare A or Compare B if requested.
+        Run the walk on a worker thread and hand the result to done(payload)
+        back on the main thread. work_after, if given, also runs on the worker
+        with (opts, names) so follow-up work like the file write stays off the
+        event loop too; its return value becomes the payload. A second click
+        while a walk is running is ignored, so the two action buttons cannot
+        start overlapping walks.
         """
+        if getattr(self, "_gather_busy", False):
+            self.status_var.set("Still scanning, please wait")
+            return
+        self._gather_busy = True
+        self.status_var.set("Scanning...")
+        opts = self._snapshot_options()
+        out_q = queue.Queue()
+
+        def work():
+            try:
+                names = _gather_names_sync(opts)
+                payload = names if work_after is None else work_after(opts, names)
+                out_q.put(("ok", payload))
+            except Exception as e:
+                out_q.put(("error", str(e)))
+
+        threading.Thread(target=work, daemon=True).start()
+        self.after(50, self._poll_gather, out_q, done)
+
+    def _poll_gather(self, out_q, done):
+        """Check the worker queue every 50 ms without blocking the event loop."""
         try:
-            names = self.gather_names()
-        except Exception as e:
-            messagebox.showerror("Error", str(e))
+            kind, payload = out_q.get_nowait()
+        except queue.Empty:
+            self.after(50, self._poll_gather, out_q, done)
+            return
+        self._gather_busy = False
+        if kind == "error":
+            self.status_var.set("Ready")
+            messagebox.showerror("Error", payload)
             return
-        self.text.delete("1.0", "end")
-        for n in names[:5000]:
-            self.text.insert("end", n + "\n")
+        done(payload)
 
-        # Export a preview into the compare inputs if the checkboxes are on
-        if self.send_to_a.get():
-            self.text_a.delete("1.0", "end")
-            self.text_a.insert("1.0", "\n".join(names[:5000]))
-        if self.send_to_b.get():
-            self.text_b.delete("1.0", "end")
-            self.text_b.insert("1.0", "\n".join(names[:5000]))
+    def _cancel_feed(self, widget):
+        """Invalidate any chunked feed still running for this widget so it stops quietly."""
+        self._feed_tokens[widget] = self._feed_tokens.get(widget, 0) + 1
+
+    def _feed_text(self, widget, lines, start=0, chunk=500, token=None):
+        """
+        Insert lines into a Text widget in chunks, yielding to the event loop between
+        chunks with after_idle. A synchronous bulk insert makes Tk lay out everything
+        before returning, which can freeze the window on slow machines. The token lets
+        a newer feed for the same widget cancel one that is still in flight.
+        """
+        if token is None:
+            # First call of a new feed: claim the widget and clear it
+            token = self._feed_tokens.get(widget, 0) + 1
+            self._feed_tokens[widget] = token
+            widget.delete("1.0", "end")
+        elif self._feed_tokens.get(widget) != token:
+            # A newer feed or a cancel took over this widget. Drop out.
+            return
+        batch = lines[start:start + chunk]
+        if batch:
+            widget.insert("end", "\n".join(batch) + "\n")
+        if start + chunk < len(lines):
+            self.after_idle(self._feed_text, widget, lines, start + chunk, chunk, token)
+        else:
+            # Feed finished. Drop any undo history from the bulk inserts so a big
+            # listing is not pinned in memory twice if undo gets enabled on the box.
+            try:
+                widget.edit_reset()
+            except tk.TclError:
+                pass
+
+    def preview(self):
+        """
+        Collect names on a worker thread, then render up to 5000 entries into the
+        big preview text box. Also optionally copy the same names into Compare A
+        or Compare B if requested.
+        """
+        self._start_gather(self._finish_preview)
+
+    def _finish_preview(self, names):
+        """Render a finished walk. Runs on the main thread via _poll_gather."""
+        # Feed the preview box in chunks so the UI stays responsive while rendering
+        preview_list = names[:5000]
+        self._feed_text(self.text, preview_list)
+
+        # Export a preview into the compare inputs if the checkboxes are on.
+        # The joined blob is built once and shared by both boxes.
+        if self.send_to_a.get() or self.send_to_b.get():
+            blob = "\n".join(preview_list)
+            if self.send_to_a.get():
+                self.text_a.delete("1.0", "end")
+                self.text_a.insert("1.0", blob)
+            if self.send_to_b.get():
+                self.text_b.delete("1.0", "end")
+                self.text_b.insert("1.0", blob)
         self.status_var.set(f"Previewed {len(names)} entries")
 
     def write_file(self):
         """
-        Write all collected names to the output file in the chosen folder.
-        Then optionally export the complete list into Compare A or B.
+        Collect names on a worker thread, write them to the output file in the
+        chosen folder, then optionally export the complete list into Compare A or B.
+        Both the walk and the disk write happen off the event loop; a failed
+        write surfaces through the same error dialog as a failed walk.
         """
-        try:
-            names = self.gather_names()
-        except Exception as e:
-            messagebox.showerror("Error", str(e))
-            return
-        out_path = Path(self.dir_var.get()).resolve() / (self.out_var.get().strip() or "filenames_sorted.txt")
-        try:
-            # newline="\n" forces Unix style line endings for consistency across platforms
-            with out_path.open("w", encoding="utf-8", newline="\n") as f:
-                for n in names:
-                    f.write(n + "\n")
-        except Exception as e:
-            messagebox.showerror("Write failed", str(e))
-            return
+        self._start_gather(self._finish_write, work_after=App._write_names)
 
+    @staticmethod
+    def _write_names(opts, names):
+        """
+        Runs on the worker thread after the walk: a multi second write of a huge
+        listing should not stall the window any more than the walk should.
+        Returns the pieces the main-thread finisher needs, including the joined
+        string so the compare exports do not rebuild it.
+        """
+        out_path = Path(opts["root"]) / opts["out_name"]
+        # One joined copy of the full list is shared by the file write and both
+        # compare exports, so the join happens at most once. Enormous listings
+        # skip the join for the write and only build it if an export asks for it.
+        blob = "\n".join(names) if names and len(names) <= 1_000_000 else None
+        # newline="\n" forces Unix style line endings for consistency across platforms
+        with out_path.open("w", encoding="utf-8", newline="\n") as f:
+            if blob is not None:
+                # One write of the shared string beats a write call per name
+                f.write(blob + "\n")
+            elif names:
+                # For enormous listings, stream through writelines so we never
+                # hold one giant joined string in memory on top of the list.
+                f.writelines(n + "\n" for n in names)
+        return names, out_path, blob
+
+    def _finish_write(self, payload):
+        """Report a finished write and run the compare exports on the main thread."""
+        names, out_path, blob = payload
         # Export full list into compare inputs if desired
-        if self.send_to_a.get():
-            self.text_a.delete("1.0", "end")
-            self.text_a.insert("1.0", "\n".join(names))
-        if self.send_to_b.get():
-            self.text_b.delete("1.0", "end")
-            self.text_b.insert("1.0", "\n".join(names))
+        if self.send_to_a.get() or self.send_to_b.get():
+            if blob is None:
+                blob = "\n".join(names)
+            if self.send_to_a.get():
+                self.text_a.delete("1.0", "end")
+                self.text_a.insert("1.0", blob)
+            if self.send_to_b.get():
+                self.text_b.delete("1.0", "end")
+                self.text_b.insert("1.0", blob)
 
         self.status_var.set(f"Wrote {len(names)} entries to {out_path.name}")
         messagebox.showinfo("Done", f"Wrote {len(names)} entries to\n{out_path}")
@@ -482,18 +763,29 @@ class App(tk.Tk):
         if not path:
             return
         try:
-            # Measure current sizes of A and B in bytes
-            size_a = 0
-            size_b = 0
-            if self.text_a.get("1.0", "end-1c"):
-                size_a = len(self.text_a.get("1.0", "end-1c").encode("utf-8"))
-            if self.text_b.get("1.0", "end-1c"):
-                size_b = len(self.text_b.get("1.0", "end-1c").encode("utf-8"))
-            size_new = Path(path).stat().st_size
-            if size_a + size_b + size_new > self.comp_max_combined_mb * 1024 * 1024:
-                messagebox.showerror("Too large", f"Combined size exceeds {self.comp_max_combined_mb} MB")
-                return
-            data = Path(path).read_text(encoding="utf-8", errors="ignore")
+            # Measure current sizes of A and B in bytes. Fetch each buffer once:
+            # every get() copies the whole text across the Tcl boundary, so asking
+            # twice per box doubles the copying for multi megabyte contents.
+            a_str = self.text_a.get("1.0", "end-1c")
+            b_str = self.text_b.get("1.0", "end-1c")
+            size_a = len(a_str.encode("utf-8")) if a_str else 0
+            size_b = len(b_str.encode("utf-8")) if b_str else 0
+            with open(path, "rb") as f:
+                # fstat on the open handle avoids a separate stat call on the path
+                size_new = os.fstat(f.fileno()).st_size
+                if size_a + size_b + size_new > self.comp_max_combined_mb * 1024 * 1024:
+                    messagebox.showerror("Too large", f"Combined size exceeds {self.comp_max_combined_mb} MB")
+                    return
+                if size_new:
+                    # Map the file and let str() decode directly from the mapped
+                    # pages. read_text would hold the raw bytes and the decoded
+                    # string in memory at the same time; here the raw side stays
+                    # in the page cache instead of a Python bytes object.
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        data = str(mm, "utf-8", "ignore")
+                else:
+                    # mmap cannot map an empty file, and there is nothing to load anyway
+                    data = ""
         except Exception as e:
             messagebox.showerror("Read failed", str(e))
             return
@@ -510,22 +802,17 @@ class App(tk.Tk):
           3. drop blank lines
           4. remove duplicates while keeping the first occurrence
           5. lower case items if case insensitive is selected, to match common website behavior
-          6. sort with natural_key for readability
-        Returns the cleaned list of strings.
-        """
-        items = []
-        seen = set()
-        for line in raw.splitlines():
-            s = line.strip()
-            if not s:
-                continue
-            k = s.lower() if case_insensitive else s
-            if k in seen:
-                continue
-            seen.add(k)
-            items.append(k if case_insensitive else s)
-        items.sort(key=natural_key)
-        return items
+        Returns the cleaned list of strings. The order is undefined: the compare
+        paths feed the result into sets and sort each partition themselves, so a
+        sort here would be thrown away immediately.
+        Results for inputs under a megabyte are served from a small cache, so
+        clicking Compare again with unchanged lists skips the re-parse.
+        """
+        if len(raw) < 1_000_000:
+            # The cache stores tuples; hand each caller its own list to be safe
+            return list(_parse_list_cached(raw, case_insensitive))
+        # Huge inputs bypass the cache so old blobs cannot stay pinned in memory
+        return _parse_list(raw, case_insensitive)
 
     def compare_lists(self):
         """
@@ -544,32 +831,68 @@ class App(tk.Tk):
         a = self._normalize_list(a_raw, ci)
         b = self._normalize_list(b_raw, ci)
 
+        # When case insensitive is on the items were lowercased during normalize,
+        # so the cased key skips a second casefold pass over every string.
+        key_func = natural_key_cased if ci else natural_key
         set_a = set(a)
         set_b = set(b)
-        only_a = sorted(set_a - set_b, key=natural_key)
-        only_b = sorted(set_b - set_a, key=natural_key)
-        both = sorted(set_a & set_b, key=natural_key)
-
-        # helper to produce a titled block with a count and the items below
+        # Sort each side once, then merge the two sorted sequences in one linear
+        # pass instead of building and sorting a third union set. The memoized key
+        # makes the comparisons during the merge cache hits.
+        a_sorted = sorted(set_a, key=key_func)
+        b_sorted = sorted(set_b, key=key_func)
+        only_a, only_b, both = [], [], []
+        i = j = 0
+        na, nb = len(a_sorted), len(b_sorted)
+        while i < na and j < nb:
+            ka = key_func(a_sorted[i])
+            kb = key_func(b_sorted[j])
+            if ka < kb:
+                only_a.append(a_sorted[i]); i += 1
+            elif kb < ka:
+                only_b.append(b_sorted[j]); j += 1
+            else:
+                # Distinct strings can share a key (file1 and file01, for example),
+                # so consume the whole run of equal keys on both sides and decide
+                # membership exactly with the sets instead of assuming alignment.
+                while i < na and key_func(a_sorted[i]) == ka:
+                    x = a_sorted[i]
+                    (both if x in set_b else only_a).append(x)
+                    i += 1
+                while j < nb and key_func(b_sorted[j]) == ka:
+                    y = b_sorted[j]
+                    if y not in set_a:
+                        only_b.append(y)
+                    j += 1
+        # Whatever is left on either side sorts after everything on the other,
+        # so it cannot appear in both lists.
+        only_a.extend(a_sorted[i:])
+        only_b.extend(b_sorted[j:])
+
+        # helper to produce the parts of a titled block with a count and the items below.
+        # Returning parts lets one final join assemble the whole result, instead of
+        # += on a growing string which reallocates and copies the text three times.
         def block(title, arr):
-            return title + " (" + str(len(arr)) + ")\n" + "\n".join(arr) + ("\n\n" if arr else "\n\n")
+            return [title, " (", str(len(arr)), ")\n", "\n".join(arr), "\n\n"]
 
-        result_text = ""
-        result_text += block("Only in A", only_a)
-        result_text += block("Only in B", only_b)
-        result_text += block("In both", both)
+        result_text = "".join(
+            block("Only in A", only_a) + block("Only in B", only_b) + block("In both", both)
+        )
 
         # If the combined text is huge and reduce is on, do not render into the text widget.
-        bytes_len = len(result_text.encode("utf-8"))
+        # For pure ASCII (the usual case for filename lists) the character count already
+        # is the UTF-8 byte count, so only non-ASCII results pay for a full encode.
+        bytes_len = len(result_text) if result_text.isascii() else len(result_text.encode("utf-8"))
         if self.comp_reduce_output.get() and bytes_len > int(self.comp_large_threshold_mb * 1024 * 1024):
             self.text_a.delete("1.0", "end")
             self.text_b.delete("1.0", "end")
+            self._cancel_feed(self.compare_result)
             self.compare_result.delete("1.0", "end")
             messagebox.showinfo("Large output", "Result not shown. Use 'Save results...' to download.")
             self._compare_cache = {"only_a": only_a, "only_b": only_b, "both": both, "combined": result_text}
         else:
-            self.compare_result.delete("1.0", "end")
-            self.compare_result.insert("1.0", result_text)
+            # Chunked feed keeps the window responsive while a big result renders
+            self._feed_text(self.compare_result, result_text.splitlines())
             self._compare_cache = {"only_a": only_a, "only_b": only_b, "both": both, "combined": result_text}
         self.status_var.set(f"Compared lists. A:{len(a)} B:{len(b)}")
 
@@ -653,20 +976,48 @@ class App(tk.Tk):
             b = self._normalize_list(b_raw, ci)
 
             set_a, set_b = set(a), set(b)
-            only_a = sorted(set_a - set_b, key=natural_key)
-            only_b = sorted(set_b - set_a, key=natural_key)
-            both = sorted(set_a & set_b, key=natural_key)
-
-            def block(title, arr):
-                return title + " (" + str(len(arr)) + ")\n" + "\n".join(arr) + ("\n\n" if arr else "\n\n")
-
-            combined = block("Only in A", only_a) + block("Only in B", only_b) + block("In both", both)
+            # Route every element into its bucket with one pass over each set.
+            # The three separate set operations built two extra temporary sets
+            # and probed the shared elements several times over.
+            only_a, only_b, both = [], [], []
+            if not set_a or not set_b:
+                # One side is empty, so nothing can be shared. Comparing a tiny
+                # list against a huge one is common; skip all the hash probes.
+                only_a = list(set_a)
+                only_b = list(set_b)
+            else:
+                for x in set_a:
+                    (both if x in set_b else only_a).append(x)
+                for x in set_b:
+                    if x not in set_a:
+                        only_b.append(x)
+            # Items are already lowercased when case insensitive is on, so the
+            # cased key skips a second casefold pass, same as the main compare.
+            key_func = natural_key_cased if ci else natural_key
+            only_a.sort(key=key_func)
+            only_b.sort(key=key_func)
+            both.sort(key=key_func)
+
+            # Build the combined text through one StringIO buffer. Concatenating
+            # three finished blocks with + copies each partial result; the buffer
+            # grows in place and produces the final string exactly once.
+            buf = io.StringIO()
+            # Count UTF-8 bytes as the parts are written, so the large-output gate
+            # below never has to re-encode the finished multi megabyte string.
+            # For ASCII parts (the usual case) the character count is the byte
+            # count and isascii() is a cheap C-level flag check.
+            nbytes = 0
+            for title, arr in (("Only in A", only_a), ("Only in B", only_b), ("In both", both)):
+                for part in (title, " (", str(len(arr)), ")\n", "\n".join(arr), "\n\n"):
+                    buf.write(part)
+                    nbytes += len(part) if part.isascii() else len(part.encode("utf-8"))
+            combined = buf.getvalue()
 
             # Keep a shared cache so the Save button in either window writes the same latest results
             self._compare_cache = {"only_a": only_a, "only_b": only_b, "both": both, "combined": combined}
 
             threshold_bytes = int(getattr(self, "comp_large_threshold_mb", 3) * 1024 * 1024)
-            if self.comp_reduce_output.get() and len(combined.encode("utf-8")) > threshold_bytes:
+            if self.comp_reduce_output.get() and nbytes > threshold_bytes:
                 res.delete("1.0", "end")
                 messagebox.showinfo("Large output", "Result not shown. Use 'Save results...' to download.", parent=win)
             else: